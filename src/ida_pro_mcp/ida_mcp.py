@@ -13,6 +13,7 @@ import os
 import sys
 import uuid
 import idaapi
+from types import ModuleType
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -31,11 +32,64 @@ def unload_package(package_name: str):
         del sys.modules[mod_name]
 
 
+def _package_mtime(package_name: str) -> int | None:
+    """Newest mtime (ns) of an imported package's sources, or None if not imported."""
+    module_file = getattr(sys.modules.get(package_name), "__file__", None)
+    if not module_file:
+        return None
+    newest = 0
+    for root, _dirs, files in os.walk(os.path.dirname(module_file)):
+        for name in files:
+            if name.endswith(".py"):
+                newest = max(newest, os.stat(os.path.join(root, name)).st_mtime_ns)
+    return newest
+
+
+_ida_nalt: ModuleType | None = None
+_instance_registry: ModuleType | None = None
+
+
+def _get_ida_nalt() -> ModuleType:
+    """Import ida_nalt on first use."""
+    global _ida_nalt
+    if _ida_nalt is None:
+        import ida_nalt
+        _ida_nalt = ida_nalt
+    return _ida_nalt
+
+
+def _get_instance_registry() -> ModuleType | None:
+    """Import the instance registry once, or return None if it is not available."""
+    global _instance_registry
+    if _instance_registry is None:
+        try:
+            from ida_pro_mcp import instance_registry
+        except ImportError:
+            # Fallback: import from relative path for plugin context
+            script_dir = os.path.dirname(os.path.realpath(__file__))
+            parent_dir = os.path.dirname(script_dir) if os.path.basename(script_dir) == "ida_mcp" else script_dir
+            if parent_dir not in sys.path:
+                sys.path.insert(0, parent_dir)
+            try:
+                import instance_registry
+            except ImportError:
+                return None
+        _instance_registry = instance_registry
+    return _instance_registry
+
+
+def _get_idb_path() -> str:
+    """Get the path of the currently open database."""
+    try:
+        return idaapi.get_path(idaapi.PATH_TYPE_IDB) or ""
+    except Exception:
+        return ""
+
+
 def _get_binary_name() -> str:
     """Get the name of the binary being analyzed in IDA."""
     try:
-        import ida_nalt
-        return ida_nalt.get_root_filename() or "unknown"
+        return _get_ida_nalt().get_root_filename() or "unknown"
     except Exception:
         return "unknown"
 
@@ -43,8 +97,7 @@ def _get_binary_name() -> str:
 def _get_binary_path() -> str:
     """Get the full path of the binary being analyzed in IDA."""
     try:
-        import ida_nalt
-        return ida_nalt.get_input_file_path() or ""
+        return _get_ida_nalt().get_input_file_path() or ""
     except Exception:
         return ""
 
@@ -70,6 +123,8 @@ class MCP(idaapi.plugin_t):
         self.port: int = 0
         self.instance_id: str = uuid.uuid4().hex[:8]
         self.heartbeat: "HeartbeatThread | None" = None
+        # (source mtime, IDB path) the loaded ida_mcp package belongs to
+        self.ida_mcp_key: tuple[int, str] | None = None
         return idaapi.PLUGIN_KEEP
 
     def run(self, arg):
@@ -83,12 +138,21 @@ class MCP(idaapi.plugin_t):
 
     def _start_server(self):
         """Start the MCP server with dynamic port allocation and instance registration."""
-        # HACK: ensure fresh load of ida_mcp package
-        unload_package("ida_mcp")
+        # HACK: ensure fresh load of ida_mcp package, unless it was loaded for
+        # this database and its sources haven't changed since. Module state
+        # (e.g. rpc._output_cache) is per-IDB, so switching databases reloads.
+        idb_path = _get_idb_path()
+        mtime = _package_mtime("ida_mcp")
+        if mtime is None or (mtime, idb_path) != self.ida_mcp_key:
+            unload_package("ida_mcp")
+            mtime = None
         if TYPE_CHECKING:
             from .ida_mcp import MCP_SERVER, IdaMcpHttpRequestHandler, init_caches
         else:
             from ida_mcp import MCP_SERVER, IdaMcpHttpRequestHandler, init_caches
+        if mtime is None:
+            mtime = _package_mtime("ida_mcp")
+        self.ida_mcp_key = (mtime, idb_path) if mtime is not None else None
 
         try:
             init_caches()
@@ -100,20 +164,11 @@ class MCP(idaapi.plugin_t):
         if env_port:
             self.port = int(env_port)
         else:
+            registry = _get_instance_registry()
             try:
-                from ida_pro_mcp.instance_registry import find_available_port
-                self.port = find_available_port(self.HOST)
+                self.port = registry.find_available_port(self.HOST) if registry else 13337
             except Exception:
-                # Fallback: try importing from relative path for plugin context
-                try:
-                    script_dir = os.path.dirname(os.path.realpath(__file__))
-                    parent_dir = os.path.dirname(script_dir) if os.path.basename(script_dir) == "ida_mcp" else script_dir
-                    if parent_dir not in sys.path:
-                        sys.path.insert(0, parent_dir)
-                    from instance_registry import find_available_port
-                    self.port = find_available_port(self.HOST)
-                except Exception:
-                    self.port = 13337  # Fallback to default
+                self.port = 13337  # Fallback to default
 
         try:
             MCP_SERVER.serve(
@@ -145,23 +200,15 @@ class MCP(idaapi.plugin_t):
 
     def _register_instance(self):
         """Register this instance in the multi-instance registry."""
-        try:
-            from ida_pro_mcp.instance_registry import register_instance, HeartbeatThread
-        except ImportError:
-            try:
-                script_dir = os.path.dirname(os.path.realpath(__file__))
-                parent_dir = os.path.dirname(script_dir) if os.path.basename(script_dir) == "ida_mcp" else script_dir
-                if parent_dir not in sys.path:
-                    sys.path.insert(0, parent_dir)
-                from instance_registry import register_instance, HeartbeatThread
-            except ImportError:
-                print("[MCP] Warning: Instance registry not available, multi-instance features disabled")
-                return
+        registry = _get_instance_registry()
+        if registry is None:
+            print("[MCP] Warning: Instance registry not available, multi-instance features disabled")
+            return
 
         binary_name = _get_binary_name()
         binary_path = _get_binary_path()
 
-        register_instance(
+        registry.register_instance(
             instance_id=self.instance_id,
             host=self.HOST,
             port=self.port,
@@ -170,8 +217,9 @@ class MCP(idaapi.plugin_t):
         )
 
         # Start heartbeat to keep registration alive
-        self.heartbeat = HeartbeatThread(self.instance_id)
-        self.heartbeat.start()
+        heartbeat: "HeartbeatThread" = registry.HeartbeatThread(self.instance_id)
+        heartbeat.start()
+        self.heartbeat = heartbeat
 
         print(f"  Instance: {self.instance_id} ({binary_name})")
         print(f"  Port: {self.port}")
@@ -183,15 +231,11 @@ class MCP(idaapi.plugin_t):
             self.heartbeat.stop()
             self.heartbeat = None
 
-        try:
-            from ida_pro_mcp.instance_registry import unregister_instance
-        except ImportError:
-            try:
-                from instance_registry import unregister_instance
-            except ImportError:
-                return
+        registry = _get_instance_registry()
+        if registry is None:
+            return
 
-        unregister_instance(self.instance_id)
+        registry.unregister_instance(self.instance_id)
 
     def _stop_server(self):
         """Stop the MCP server and unregister the instance."""
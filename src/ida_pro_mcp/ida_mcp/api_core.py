@@ -31,6 +31,8 @@ def invalidate_strings_cache():
 
 def init_caches():
     """Build caches on plugin startup (called from Ctrl+M)."""
+    # The package may be reused across restarts, so always rebuild
+    invalidate_strings_cache()
     t0 = time.perf_counter()
     strings = _get_strings_cache()
     t1 = time.perf_counter()
@@ -11,20 +11,71 @@ Architecture (Centralized Host Model):
 
 Registry files are stored in ~/.ida-mcp/instances/ as JSON files.
 Each file contains instance metadata: port, binary name, PID, timestamp.
+Heartbeats only touch the file, so its mtime is the last-seen time.
+
+If the optional `orjson` package is installed it is used for encoding and
+decoding registration files.
+
+If the optional `watchdog` package is installed, long-lived readers keep an
+in-memory snapshot of the registry that is updated from filesystem events
+instead of rescanning the directory on every lookup.
+
+Both are declared in the `fast` extra (`pip install ida-pro-mcp[fast]`).
+
+Instances also record themselves in a small memory-mapped index
+(index.bin in the registry directory) so binary-name lookups can find the
+matching registration without reading every file. The JSON files remain
+authoritative: index hits are verified against them and misses fall back
+to a full scan.
 """
 
+import hashlib
 import json
+import mmap
 import os
+import random
+import struct
 import time
 import socket
 import threading
+import zlib
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Iterator, Optional
+
+try:
+    import orjson
+
+    def _dumps(data: dict) -> bytes:
+        return orjson.dumps(data)
+
+    _loads = orjson.loads
+except ImportError:
+
+    def _dumps(data: dict) -> bytes:
+        return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+    _loads = json.loads
+
+if TYPE_CHECKING:
+    from watchdog.events import FileSystemEvent, FileSystemEventHandler
+    from watchdog.observers import Observer
+
+    _HAVE_WATCHDOG = True
+else:
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+
+        _HAVE_WATCHDOG = True
+    except ImportError:
+        FileSystemEventHandler = object
+        _HAVE_WATCHDOG = False
 
 # Registry directory
 REGISTRY_DIR = Path.home() / ".ida-mcp" / "instances"
 
-# Port range for dynamic allocation
+# Preferred port range for dynamic allocation
 PORT_RANGE_START = 13337
 PORT_RANGE_END = 13437  # 100 ports available
 
@@ -34,27 +85,21 @@ STALE_TIMEOUT = 60
 # Heartbeat interval (seconds)
 HEARTBEAT_INTERVAL = 30
 
+# Parsed registration files, keyed by path -> ((st_mtime_ns, st_size), info)
+_parse_cache: dict[str, tuple[tuple[int, int], "InstanceInfo"]] = {}
+
 
+@dataclass(slots=True, repr=False, eq=False)
 class InstanceInfo:
     """Information about a registered IDA instance."""
 
-    def __init__(
-        self,
-        instance_id: str,
-        host: str,
-        port: int,
-        binary_name: str,
-        binary_path: str,
-        pid: int,
-        timestamp: float,
-    ):
-        self.instance_id = instance_id
-        self.host = host
-        self.port = port
-        self.binary_name = binary_name
-        self.binary_path = binary_path
-        self.pid = pid
-        self.timestamp = timestamp
+    instance_id: str
+    host: str
+    port: int
+    binary_name: str
+    binary_path: str
+    pid: int
+    timestamp: float
 
     def to_dict(self) -> dict:
         return {
@@ -113,39 +158,501 @@ class InstanceInfo:
         return f"InstanceInfo({self.instance_id}, {self.binary_name}, {self.host}:{self.port})"
 
 
+_initialized_registry_dir: Optional[Path] = None
+# Bumped whenever the registry directory turns out to have been removed
+_registry_dir_generation = 0
+
+
 def _ensure_registry_dir() -> Path:
-    """Ensure the registry directory exists."""
-    REGISTRY_DIR.mkdir(parents=True, exist_ok=True)
+    """Ensure the registry directory exists (once per REGISTRY_DIR value)."""
+    global _initialized_registry_dir
+    if _initialized_registry_dir != REGISTRY_DIR:
+        REGISTRY_DIR.mkdir(parents=True, exist_ok=True)
+        _initialized_registry_dir = REGISTRY_DIR
     return REGISTRY_DIR
 
 
+def _forget_registry_dir(directory: Path):
+    """Make the next _ensure_registry_dir() recreate a directory that was removed."""
+    global _initialized_registry_dir, _registry_dir_generation
+    if _initialized_registry_dir == directory:
+        _initialized_registry_dir = None
+        _registry_dir_generation += 1
+
+
 def _instance_file(instance_id: str) -> Path:
     """Get the path to an instance registration file."""
     return REGISTRY_DIR / f"{instance_id}.json"
 
 
-def find_available_port(host: str = "127.0.0.1") -> int:
-    """Find an available port in the configured range.
+def _registry_entries(directory: Path, temp_files: bool = False) -> Iterator[os.DirEntry]:
+    """Yield the directory entries of the registration files in a directory.
+
+    With ``temp_files`` set, yield the temporary files left behind by
+    interrupted writes instead.
+    """
+    try:
+        it = os.scandir(directory)
+    except FileNotFoundError:
+        _forget_registry_dir(directory)
+        return
+    with it:
+        for entry in it:
+            if temp_files:
+                if ".json.tmp." in entry.name:
+                    yield entry
+            elif entry.name.endswith(".json"):
+                yield entry
+
+
+def _load_instance(path: str | Path, st: Optional[os.stat_result] = None) -> InstanceInfo:
+    """Load a registration file, reusing the parsed result if it is unchanged.
+
+    Args:
+        path: Path to the registration file
+        st: The file's stat result, if the caller already has it
 
-    Checks both the OS-level port availability and the registry to avoid
-    conflicts with other IDA instances.
+    Raises:
+        OSError, json.JSONDecodeError, KeyError: If the file is missing or invalid
     """
-    registered_ports = {inst.port for inst in list_instances()}
+    key = os.fspath(path)
+    if st is None:
+        st = os.stat(key)
+    # Freed inodes are often reused for a same-size rewrite (e.g. toggling the
+    # server re-registers the same ID on a new port), and DirEntry.stat()
+    # reports st_ino == 0 on Windows, so only the mtime and size are compared
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _parse_cache.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    with open(key, "rb") as f:
+        data = _loads(f.read())
+    info = InstanceInfo.from_dict(data)
+    # Heartbeats bump the mtime without rewriting the embedded timestamp
+    info.timestamp = st.st_mtime
+    _parse_cache[key] = (stamp, info)
+    return info
+
+
+def _remove_instance_file(path: str | Path):
+    """Delete a registration file and drop it from the in-memory caches."""
+    path = os.fspath(path)
+    _parse_cache.pop(path, None)
+    name = os.path.basename(path)
+    watcher = _active_watcher()
+    if watcher is not None:
+        watcher.discard(name)
+    index = _get_shared_index()
+    if index is not None:
+        index.remove(name[: -len(".json")])
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+_REPLACE_ATTEMPTS = 5
+
+
+def _atomic_write_json(path: Path, data: dict):
+    """Write a registration file so readers never observe a partial write."""
+    tmp_path = path.with_suffix(f".json.tmp.{os.getpid()}")
+    try:
+        for retried in (False, True):
+            try:
+                with open(tmp_path, "wb") as f:
+                    f.write(_dumps(data))
+                break
+            except FileNotFoundError:
+                if retried:
+                    raise
+                # The registry directory was removed behind our back
+                _forget_registry_dir(path.parent)
+                _ensure_registry_dir()
+        for attempt in range(_REPLACE_ATTEMPTS):
+            try:
+                os.replace(tmp_path, path)
+                break
+            except PermissionError:
+                # Windows refuses to replace a file another process has open;
+                # readers only hold it briefly, so try again
+                if attempt == _REPLACE_ATTEMPTS - 1:
+                    raise
+                time.sleep(0.01)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
 
-    for port in range(PORT_RANGE_START, PORT_RANGE_END):
-        if port in registered_ports:
+def _scan_registry_dir() -> Iterator[InstanceInfo]:
+    """Read every registration file, skipping unreadable ones."""
+    seen = set()
+    for entry in _registry_entries(REGISTRY_DIR):
+        seen.add(entry.path)
+        try:
+            info = _load_instance(entry.path, entry.stat())
+        except (json.JSONDecodeError, KeyError, OSError):
+            # Transient (e.g. removed or written in-place by an older
+            # version), cleanup_stale_instances deals with leftovers
             continue
+        yield info
+
+    # Full pass completed: forget files other processes have removed. Iterate
+    # over a copy since other threads may load or evict entries concurrently
+    directory = os.fspath(REGISTRY_DIR)
+    for key in [k for k in list(_parse_cache) if os.path.dirname(k) == directory and k not in seen]:
+        _parse_cache.pop(key, None)
+
+
+class _RegistryWatcher(FileSystemEventHandler):
+    """Keeps an in-memory snapshot of the registry directory, keyed by file name."""
+
+    def __init__(self, directory: Path):
+        super().__init__()
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._instances: dict[str, InstanceInfo] = {}
+        self._directory_ino = os.stat(directory).st_ino
+        self._observer = Observer()
+        self._observer.schedule(self, str(directory), recursive=False)
+
+    def start(self):
+        self._observer.start()
+        try:
+            # Scan after the observer is running so no change is missed
+            for entry in _registry_entries(self.directory):
+                self.reload(entry.name)
+        except BaseException:
+            self.stop()
+            raise
+
+    def stop(self):
+        self._observer.stop()
+        self._observer.join(timeout=5)
+
+    def is_current(self) -> bool:
+        """Whether the watched directory still exists (a recreated one isn't watched)."""
+        try:
+            return os.stat(self.directory).st_ino == self._directory_ino
+        except OSError:
+            return False
+
+    def snapshot(self) -> list[InstanceInfo]:
+        with self._lock:
+            return list(self._instances.values())
+
+    def get(self, name: str) -> Optional[InstanceInfo]:
+        with self._lock:
+            return self._instances.get(name)
+
+    def update(self, name: str, info: InstanceInfo):
+        with self._lock:
+            self._instances[name] = info
+
+    def discard(self, name: str):
+        with self._lock:
+            self._instances.pop(name, None)
+
+    def reload(self, name: str):
+        try:
+            info = _load_instance(self.directory / name)
+        except (json.JSONDecodeError, KeyError, OSError):
+            # Deleted or mid-write; a later event will bring it back
+            self.discard(name)
+            return
+        self.update(name, info)
+
+    def _handle_removed(self, path: "bytes | str"):
+        name = os.path.basename(os.fsdecode(path))
+        self.discard(name)
+        _parse_cache.pop(str(self.directory / name), None)
+
+    def _handle_changed(self, path: "bytes | str"):
+        name = os.path.basename(os.fsdecode(path))
+        if name.endswith(".json"):
+            self.reload(name)
+
+    def on_created(self, event: "FileSystemEvent"):
+        if not event.is_directory:
+            self._handle_changed(event.src_path)
+
+    def on_modified(self, event: "FileSystemEvent"):
+        if not event.is_directory:
+            self._handle_changed(event.src_path)
+
+    def on_deleted(self, event: "FileSystemEvent"):
+        if not event.is_directory:
+            self._handle_removed(event.src_path)
+
+    def on_moved(self, event: "FileSystemEvent"):
+        if not event.is_directory:
+            self._handle_removed(event.src_path)
+            self._handle_changed(event.dest_path)
+
+
+_watcher: Optional[_RegistryWatcher] = None
+_watcher_failed_dir: Optional[Path] = None
+_watcher_lock = threading.Lock()
+
+
+def _active_watcher() -> Optional[_RegistryWatcher]:
+    """Return the running watcher if it is watching the current REGISTRY_DIR."""
+    watcher = _watcher
+    if watcher is None or watcher.directory != REGISTRY_DIR:
+        return None
+    if not watcher.is_current():
+        _forget_registry_dir(watcher.directory)
+        return None
+    return watcher
+
+
+def _get_watcher() -> Optional[_RegistryWatcher]:
+    """Lazily start the registry watcher.
+
+    Returns None if watchdog is unavailable or the watcher could not be
+    started for the current REGISTRY_DIR (the failure is not retried).
+    """
+    global _watcher, _watcher_failed_dir
+    if not _HAVE_WATCHDOG or _watcher_failed_dir == REGISTRY_DIR:
+        return None
+
+    with _watcher_lock:
+        watcher = _active_watcher()
+        if watcher is not None:
+            return watcher
+
+        # REGISTRY_DIR changed or was removed (or first use): restart on
+        # the current directory
+        if _watcher is not None:
+            _watcher.stop()
+            _watcher = None
+
+        try:
+            watcher = _RegistryWatcher(_ensure_registry_dir())
+            watcher.start()
+        except OSError:
+            # e.g. inotify watch limit reached, fall back to scanning
+            _watcher_failed_dir = REGISTRY_DIR
+            return None
+        _watcher = watcher
+        return watcher
+
+
+class _SharedIndex:
+    """Fixed-size table of registered instances in a memory-mapped file.
+
+    Each slot holds (pid, port, instance_id, binary name hash, timestamp).
+    Writers from different processes are not locked against each other, so
+    the table is only a hint: readers must verify hits against the JSON file.
+    """
+
+    ENTRY = struct.Struct("<IH32s32sd")
+    SLOTS = 128
+    # Marks a removed slot; pid=0 would end other probe chains early
+    TOMBSTONE_PID = 0xFFFFFFFF
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.generation = _registry_dir_generation
+        self._lock = threading.Lock()
+        self._closed = False
+        size = self.ENTRY.size * self.SLOTS
+        fd = os.open(directory / "index.bin", os.O_RDWR | os.O_CREAT, 0o600)
         try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if os.fstat(fd).st_size < size:
+                os.ftruncate(fd, size)
+            self._map = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+
+    def close(self):
+        # Other threads may still hold this index; once closed, their
+        # updates are ignored and lookups miss instead of raising
+        with self._lock:
+            self._closed = True
+            self._map.close()
+
+    @staticmethod
+    def _binary_key(binary_name: str) -> bytes:
+        return hashlib.sha256(binary_name.lower().encode("utf-8")).digest()
+
+    @staticmethod
+    def _instance_key(instance_id: str) -> Optional[bytes]:
+        """Encode an instance ID as stored in a slot, or None if it doesn't fit."""
+        key = instance_id.encode("utf-8")
+        if len(key) > 32:
+            return None
+        return key.ljust(32, b"\0")
+
+    def _probe(self, instance_key: bytes) -> Iterator[int]:
+        """Yield slot offsets in probe order for an instance."""
+        start = zlib.crc32(instance_key) % self.SLOTS
+        for i in range(self.SLOTS):
+            yield ((start + i) % self.SLOTS) * self.ENTRY.size
+
+    def _find(self, instance_key: bytes) -> Optional[int]:
+        for offset in self._probe(instance_key):
+            pid, _, key, _, _ = self.ENTRY.unpack_from(self._map, offset)
+            if pid == 0:
+                return None
+            if key == instance_key:
+                return offset
+        return None
+
+    def add(self, info: InstanceInfo):
+        instance_key = self._instance_key(info.instance_id)
+        if instance_key is None:
+            return  # Lookups for this instance fall back to scanning
+        entry = (
+            info.pid,
+            info.port,
+            instance_key,
+            self._binary_key(info.binary_name),
+            info.timestamp,
+        )
+        now = time.time()
+        with self._lock:
+            if self._closed:
+                return
+            offset = self._find(instance_key)
+            if offset is None:
+                # Take the first empty slot, or one whose owner stopped heartbeating
+                for candidate in self._probe(instance_key):
+                    pid, _, _, _, timestamp = self.ENTRY.unpack_from(self._map, candidate)
+                    if pid in (0, self.TOMBSTONE_PID) or now - timestamp > STALE_TIMEOUT:
+                        offset = candidate
+                        break
+                else:
+                    return  # Table full
+            self.ENTRY.pack_into(self._map, offset, *entry)
+
+    def touch(self, instance_id: str):
+        instance_key = self._instance_key(instance_id)
+        if instance_key is None:
+            return
+        with self._lock:
+            if self._closed:
+                return
+            offset = self._find(instance_key)
+            if offset is not None:
+                timestamp_offset = offset + self.ENTRY.size - 8
+                struct.pack_into("<d", self._map, timestamp_offset, time.time())
+
+    def remove(self, instance_id: str):
+        instance_key = self._instance_key(instance_id)
+        if instance_key is None:
+            return
+        with self._lock:
+            if self._closed:
+                return
+            offset = self._find(instance_key)
+            if offset is not None:
+                self.ENTRY.pack_into(self._map, offset, self.TOMBSTONE_PID, 0, b"", b"", 0.0)
+
+    def find_by_binary(self, binary_name: str) -> Iterator[str]:
+        """Yield IDs of recently refreshed instances whose binary name hash matches."""
+        binary_key = self._binary_key(binary_name)
+        now = time.time()
+        # Read every slot under the lock so the index can't be closed mid-scan
+        matches = []
+        with self._lock:
+            if self._closed:
+                return
+            for offset in range(0, self.ENTRY.size * self.SLOTS, self.ENTRY.size):
+                pid, _, key, entry_binary, timestamp = self.ENTRY.unpack_from(self._map, offset)
+                if pid in (0, self.TOMBSTONE_PID):
+                    continue
+                if entry_binary == binary_key and now - timestamp <= STALE_TIMEOUT:
+                    matches.append(key)
+        for key in matches:
+            yield key.rstrip(b"\0").decode("utf-8", "replace")
+
+
+_shared_index: Optional[_SharedIndex] = None
+_shared_index_failed_dir: Optional[Path] = None
+_shared_index_lock = threading.Lock()
+
+
+def _get_shared_index() -> Optional[_SharedIndex]:
+    """Lazily map the shared index for REGISTRY_DIR.
+
+    Returns None if the index could not be mapped for the current
+    REGISTRY_DIR (the failure is not retried).
+    """
+    global _shared_index, _shared_index_failed_dir
+    if _shared_index_failed_dir == REGISTRY_DIR:
+        return None
+
+    with _shared_index_lock:
+        if (
+            _shared_index is not None
+            and _shared_index.directory == REGISTRY_DIR
+            and _shared_index.generation == _registry_dir_generation
+        ):
+            return _shared_index
+        if _shared_index is not None:
+            _shared_index.close()
+            _shared_index = None
+        try:
+            _shared_index = _SharedIndex(_ensure_registry_dir())
+        except (OSError, ValueError):
+            # e.g. a read-only registry directory, fall back to scanning
+            _shared_index_failed_dir = REGISTRY_DIR
+            return None
+        return _shared_index
+
+
+def _port_accepts_connections(host: str, port: int) -> bool:
+    """Check whether something is already listening on the port."""
+    try:
+        with socket.create_connection((host, port), timeout=0.05):
+            return True
+    except OSError:
+        return False
+
+
+def find_available_port(host: str = "127.0.0.1") -> int:
+    """Find an available port, preferring the configured range.
+
+    Binding is the authoritative check: a port held by another IDA instance
+    (or any other process) fails to bind, so the registry is not consulted.
+    SO_REUSEADDR is deliberately not set so that sharing cannot mask a
+    conflict. A probe socket is only replaced after it has been used.
+
+    PORT_RANGE_START is always tried first, so a lone instance keeps the
+    default port. The rest of the range is scanned from a random offset with
+    wrap-around, so instances that start at the same time don't all race for
+    the same next port. If every port in the range is taken, the kernel picks
+    a free one instead (clients find it through the registry).
+    """
+    rest = PORT_RANGE_END - PORT_RANGE_START - 1
+    offset = random.randrange(rest) if rest > 0 else 0
+    candidates = [PORT_RANGE_START]
+    candidates += [PORT_RANGE_START + 1 + (offset + i) % rest for i in range(rest)]
+    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        for port in candidates:
+            try:
                 s.bind((host, port))
+            except OSError:
+                # Some platforms refuse to re-bind after a failed bind
+                s.close()
+                s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                continue
+
+            # Guard against a listener the bind did not conflict with
+            # (e.g. a different address family or a reuse-enabled socket)
+            if not _port_accepts_connections(host, port):
                 return port
-        except OSError:
-            continue
+            s.close()
+            s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
 
-    raise RuntimeError(
-        f"No available ports in range {PORT_RANGE_START}-{PORT_RANGE_END}"
-    )
+        # Range exhausted: let the kernel assign a free ephemeral port
+        s.bind((host, 0))
+        return s.getsockname()[1]
+    finally:
+        s.close()
 
 
 def register_instance(
@@ -180,8 +687,15 @@ def register_instance(
     )
 
     filepath = _instance_file(instance_id)
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(info.to_dict(), f, indent=2)
+    _atomic_write_json(filepath, info.to_dict())
+
+    watcher = _active_watcher()
+    if watcher is not None:
+        watcher.update(filepath.name, info)
+
+    index = _get_shared_index()
+    if index is not None:
+        index.add(info)
 
     return info
 
@@ -192,9 +706,10 @@ def unregister_instance(instance_id: str) -> bool:
     Returns:
         True if the instance was found and removed, False otherwise
     """
+    _heartbeat.remove(instance_id)
     filepath = _instance_file(instance_id)
     try:
-        filepath.unlink(missing_ok=True)
+        _remove_instance_file(filepath)
         return True
     except OSError:
         return False
@@ -203,23 +718,45 @@ def unregister_instance(instance_id: str) -> bool:
 def refresh_instance(instance_id: str) -> bool:
     """Update the timestamp of an instance registration (heartbeat).
 
+    Only the file's mtime is updated; the contents are left untouched.
+
     Returns:
         True if the instance was found and refreshed, False otherwise
     """
     filepath = _instance_file(instance_id)
-    if not filepath.exists():
-        return False
-
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        data["timestamp"] = time.time()
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
-        return True
-    except (json.JSONDecodeError, OSError, KeyError):
+        os.utime(filepath, None)
+    except OSError:
         return False
 
+    watcher = _active_watcher()
+    if watcher is not None:
+        watcher.reload(filepath.name)
+
+    index = _get_shared_index()
+    if index is not None:
+        index.touch(instance_id)
+    return True
+
+
+def _iter_instances(*, include_stale: bool = False) -> Iterator[InstanceInfo]:
+    """Yield registered instances one at a time.
+
+    Uses the watcher snapshot when available, otherwise scans the registry
+    directory. Stale instances are skipped without probing their process;
+    removing them is left to cleanup_stale_instances.
+    """
+    _ensure_registry_dir()
+
+    watcher = _get_watcher()
+    candidates = watcher.snapshot() if watcher is not None else _scan_registry_dir()
+
+    for info in candidates:
+        # Skip stale instances unless requested
+        if not include_stale and info.is_stale():
+            continue
+        yield info
+
 
 def list_instances(*, include_stale: bool = False) -> list[InstanceInfo]:
     """List all registered instances.
@@ -230,35 +767,15 @@ def list_instances(*, include_stale: bool = False) -> list[InstanceInfo]:
     Returns:
         List of InstanceInfo objects for active instances
     """
-    _ensure_registry_dir()
-    instances = []
-
-    for filepath in REGISTRY_DIR.glob("*.json"):
-        try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            info = InstanceInfo.from_dict(data)
-
-            # Skip stale instances unless requested
-            if not include_stale and info.is_stale() and not info.is_alive():
-                # Clean up stale registration
-                filepath.unlink(missing_ok=True)
-                continue
-
-            instances.append(info)
-        except (json.JSONDecodeError, KeyError, OSError):
-            # Invalid registration file, clean up
-            try:
-                filepath.unlink(missing_ok=True)
-            except OSError:
-                pass
-
-    return instances
+    return list(_iter_instances(include_stale=include_stale))
 
 
 def find_instance_by_binary(binary_name: str) -> Optional[InstanceInfo]:
     """Find an instance by the binary name it's analyzing.
 
+    Candidates from the shared index are checked first; otherwise the
+    registry is scanned, stopping at the first match.
+
     Args:
         binary_name: Name of the binary to search for (case-insensitive)
 
@@ -266,7 +783,15 @@ def find_instance_by_binary(binary_name: str) -> Optional[InstanceInfo]:
         InstanceInfo if found, None otherwise
     """
     binary_name_lower = binary_name.lower()
-    for info in list_instances():
+
+    index = _get_shared_index()
+    if index is not None:
+        for instance_id in index.find_by_binary(binary_name):
+            info = find_instance_by_id(instance_id)
+            if info is not None and not info.is_stale() and info.binary_name.lower() == binary_name_lower:
+                return info
+
+    for info in _iter_instances():
         if info.binary_name.lower() == binary_name_lower:
             return info
     return None
@@ -282,13 +807,18 @@ def find_instance_by_id(instance_id: str) -> Optional[InstanceInfo]:
         InstanceInfo if found, None otherwise
     """
     filepath = _instance_file(instance_id)
+
+    watcher = _get_watcher()
+    if watcher is not None:
+        info = watcher.get(filepath.name)
+        if info is not None:
+            return info
+
     if not filepath.exists():
         return None
 
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return InstanceInfo.from_dict(data)
+        return _load_instance(filepath)
     except (json.JSONDecodeError, KeyError, OSError):
         return None
 
@@ -301,46 +831,121 @@ def cleanup_stale_instances() -> int:
     """
     removed = 0
     _ensure_registry_dir()
-    for filepath in REGISTRY_DIR.glob("*.json"):
+    for entry in _registry_entries(REGISTRY_DIR):
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            info = InstanceInfo.from_dict(data)
-            if info.is_stale() and not info.is_alive():
-                filepath.unlink(missing_ok=True)
-                removed += 1
-        except (json.JSONDecodeError, KeyError, OSError):
+            st = entry.stat()
+        except OSError:
+            continue
+        try:
+            info = _load_instance(entry.path, st)
+        except (json.JSONDecodeError, KeyError):
+            # Only remove unreadable files once they are old enough that
+            # they can't be an in-progress write
+            if time.time() - st.st_mtime > STALE_TIMEOUT:
+                try:
+                    _remove_instance_file(entry.path)
+                    removed += 1
+                except OSError:
+                    pass
+            continue
+        except OSError:
+            continue
+
+        if info.is_stale() and not info.is_alive():
             try:
-                filepath.unlink(missing_ok=True)
+                _remove_instance_file(entry.path)
                 removed += 1
             except OSError:
                 pass
+
+    # Sweep temporary files left behind by writers that crashed mid-write
+    for entry in _registry_entries(REGISTRY_DIR, temp_files=True):
+        try:
+            if time.time() - entry.stat().st_mtime > STALE_TIMEOUT:
+                os.unlink(entry.path)
+        except OSError:
+            pass
     return removed
 
 
+class _HeartbeatCoordinator:
+    """Single background thread that refreshes every instance registered with it."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._instance_ids: set[str] = set()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, instance_id: str) -> threading.Thread:
+        """Start heartbeating an instance. Returns the shared worker thread."""
+        with self._lock:
+            self._instance_ids.add(instance_id)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            thread = self._thread
+        refresh_instance(instance_id)
+        return thread
+
+    def remove(self, instance_id: str) -> bool:
+        """Stop heartbeating an instance.
+
+        Returns:
+            True if no instances remain and the worker thread is exiting
+        """
+        with self._lock:
+            self._instance_ids.discard(instance_id)
+            if self._instance_ids or self._thread is None:
+                return False
+            self._wakeup.set()
+            return True
+
+    def _run(self):
+        try:
+            while True:
+                self._wakeup.wait(timeout=HEARTBEAT_INTERVAL)
+                with self._lock:
+                    self._wakeup.clear()
+                    if not self._instance_ids:
+                        self._thread = None
+                        return
+                    instance_ids = list(self._instance_ids)
+                for instance_id in instance_ids:
+                    # Removal of the last instance sets the event; stop early
+                    # instead of finishing the batch so stop() isn't held up
+                    if self._wakeup.is_set():
+                        break
+                    try:
+                        refresh_instance(instance_id)
+                    except Exception as e:
+                        # Keep heartbeating the other instances, but don't hide the bug
+                        print(f"[MCP] Heartbeat for {instance_id} failed: {e!r}")
+        finally:
+            # Don't hand a dead thread to later add() calls
+            with self._lock:
+                if self._thread is threading.current_thread():
+                    self._thread = None
+
+
+_heartbeat = _HeartbeatCoordinator()
+
+
 class HeartbeatThread:
-    """Background thread that periodically refreshes instance registration."""
+    """Keeps an instance registration alive using the shared heartbeat thread."""
 
     def __init__(self, instance_id: str):
         self.instance_id = instance_id
-        self._stop_event = threading.Event()
         self._thread: Optional[threading.Thread] = None
 
     def start(self):
-        """Start the heartbeat thread."""
+        """Start the heartbeat for this instance."""
         if self._thread is not None:
             return
-        self._thread = threading.Thread(target=self._run, daemon=True)
-        self._thread.start()
+        self._thread = _heartbeat.add(self.instance_id)
 
     def stop(self):
-        """Stop the heartbeat thread."""
-        self._stop_event.set()
-        if self._thread is not None:
-            self._thread.join(timeout=5)
-            self._thread = None
-
-    def _run(self):
-        while not self._stop_event.is_set():
-            refresh_instance(self.instance_id)
-            self._stop_event.wait(timeout=HEARTBEAT_INTERVAL)
+        """Stop the heartbeat for this instance."""
+        thread, self._thread = self._thread, None
+        if _heartbeat.remove(self.instance_id) and thread is not None:
+            thread.join(timeout=1)
@@ -6,12 +6,16 @@ multi-instance MCP support. They run without IDA Pro.
 
 import json
 import os
+import socket
+import sys
 import time
 import tempfile
 import unittest
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import patch
 
+import ida_pro_mcp.instance_registry as reg_module
 from ida_pro_mcp.instance_registry import (
     InstanceInfo,
     register_instance,
@@ -28,6 +32,14 @@ from ida_pro_mcp.instance_registry import (
 )
 
 
+def _close_shared_index():
+    """Unmap the shared index so the temporary registry directory can be removed."""
+    if reg_module._shared_index is not None:
+        reg_module._shared_index.close()
+        reg_module._shared_index = None
+    reg_module._shared_index_failed_dir = None
+
+
 class TestInstanceInfo(unittest.TestCase):
     """Tests for the InstanceInfo data class."""
 
@@ -80,6 +92,20 @@ class TestInstanceInfo(unittest.TestCase):
         self.assertEqual(info.port, info2.port)
         self.assertEqual(info.binary_name, info2.binary_name)
 
+    def test_hashable_by_identity(self):
+        info = InstanceInfo(
+            instance_id="abc",
+            host="127.0.0.1",
+            port=13338,
+            binary_name="hello.elf",
+            binary_path="/tmp/hello.elf",
+            pid=999,
+            timestamp=1000.0,
+        )
+        twin = InstanceInfo.from_dict(info.to_dict())
+        self.assertEqual(len({info, twin}), 2)
+        self.assertNotEqual(info, twin)
+
     def test_is_stale_fresh(self):
         info = InstanceInfo(
             instance_id="fresh",
@@ -137,13 +163,12 @@ class TestRegistryOperations(unittest.TestCase):
         self.temp_dir = tempfile.mkdtemp()
         self.original_registry_dir = REGISTRY_DIR
         # Patch the module-level REGISTRY_DIR
-        import ida_pro_mcp.instance_registry as reg_module
         reg_module.REGISTRY_DIR = Path(self.temp_dir)
 
     def tearDown(self):
         """Restore original registry dir and clean up."""
-        import ida_pro_mcp.instance_registry as reg_module
         reg_module.REGISTRY_DIR = self.original_registry_dir
+        _close_shared_index()
         import shutil
         shutil.rmtree(self.temp_dir, ignore_errors=True)
 
@@ -229,6 +254,10 @@ class TestRegistryOperations(unittest.TestCase):
         instances = list_instances()
         self.assertEqual(len(instances), 0)
 
+    def test_registry_entries_of_missing_directory(self):
+        missing = Path(self.temp_dir) / "missing"
+        self.assertEqual(list(reg_module._registry_entries(missing)), [])
+
     def test_refresh_instance(self):
         register_instance(
             instance_id="refresh1",
@@ -247,13 +276,28 @@ class TestRegistryOperations(unittest.TestCase):
         # Timestamp should be updated
         self.assertGreater(found.timestamp, time.time() - 1)
 
+    def test_refresh_keeps_contents(self):
+        register_instance(
+            instance_id="refresh2",
+            host="127.0.0.1",
+            port=13348,
+            binary_name="test.exe",
+        )
+        filepath = Path(self.temp_dir) / "refresh2.json"
+        old_time = time.time() - STALE_TIMEOUT - 10
+        os.utime(filepath, (old_time, old_time))
+        before = filepath.read_bytes()
+        self.assertTrue(find_instance_by_id("refresh2").is_stale())
+
+        self.assertTrue(refresh_instance("refresh2"))
+        self.assertEqual(filepath.read_bytes(), before)
+        self.assertFalse(find_instance_by_id("refresh2").is_stale())
+
     def test_refresh_nonexistent(self):
         result = refresh_instance("nonexistent")
         self.assertFalse(result)
 
     def test_cleanup_stale_instances(self):
-        import ida_pro_mcp.instance_registry as reg_module
-
         # Create a stale instance with a dead PID
         stale_info = InstanceInfo(
             instance_id="stale1",
@@ -267,6 +311,8 @@ class TestRegistryOperations(unittest.TestCase):
         filepath = Path(self.temp_dir) / "stale1.json"
         with open(filepath, "w") as f:
             json.dump(stale_info.to_dict(), f)
+        # Liveness is tracked by the file's mtime
+        os.utime(filepath, (stale_info.timestamp, stale_info.timestamp))
 
         # Create a fresh instance
         register_instance(
@@ -284,6 +330,331 @@ class TestRegistryOperations(unittest.TestCase):
         self.assertEqual(len(instances), 1)
         self.assertEqual(instances[0].instance_id, "fresh1")
 
+    def test_cleanup_sweeps_old_temp_files(self):
+        old_tmp = Path(self.temp_dir) / "crashed.json.tmp.4242"
+        old_tmp.write_text("{")
+        old_time = time.time() - STALE_TIMEOUT - 10
+        os.utime(old_tmp, (old_time, old_time))
+        new_tmp = Path(self.temp_dir) / "writing.json.tmp.4243"
+        new_tmp.write_text("{")
+
+        self.assertEqual(cleanup_stale_instances(), 0)
+        self.assertFalse(old_tmp.exists())
+        self.assertTrue(new_tmp.exists())
+
+    def test_register_retries_replace_on_permission_error(self):
+        real_replace = os.replace
+        calls = []
+
+        def flaky_replace(src, dst):
+            calls.append(dst)
+            if len(calls) == 1:
+                raise PermissionError("file in use")
+            real_replace(src, dst)
+
+        with patch("ida_pro_mcp.instance_registry.os.replace", flaky_replace):
+            register_instance(
+                instance_id="locked1",
+                host="127.0.0.1",
+                port=13347,
+                binary_name="test.exe",
+            )
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(find_instance_by_id("locked1").port, 13347)
+
+    def test_find_by_id_reuses_parsed_instance(self):
+        register_instance(
+            instance_id="cached1",
+            host="127.0.0.1",
+            port=13346,
+            binary_name="test.exe",
+        )
+
+        first = find_instance_by_id("cached1")
+        second = find_instance_by_id("cached1")
+        self.assertIs(first, second)
+
+    def test_scan_evicts_externally_removed_files(self):
+        register_instance(
+            instance_id="cached3",
+            host="127.0.0.1",
+            port=13354,
+            binary_name="test.exe",
+        )
+        filepath = str(Path(self.temp_dir) / "cached3.json")
+        with patch.object(reg_module, "_get_watcher", return_value=None):
+            self.assertEqual(len(list_instances()), 1)
+            self.assertIn(filepath, reg_module._parse_cache)
+
+            # Removed by another process, bypassing _remove_instance_file
+            os.unlink(filepath)
+            self.assertEqual(list_instances(), [])
+            self.assertNotIn(filepath, reg_module._parse_cache)
+
+    def test_concurrent_scans_with_changing_files(self):
+        import threading
+
+        errors = []
+        stop = threading.Event()
+
+        def scan():
+            while not stop.is_set():
+                try:
+                    list_instances()
+                except Exception as e:
+                    errors.append(e)
+                    return
+
+        # Switch threads often so scans overlap with cache updates
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, interval)
+        with patch.object(reg_module, "_get_watcher", return_value=None):
+            threads = [threading.Thread(target=scan) for _ in range(4)]
+            for t in threads:
+                t.start()
+            try:
+                for i in range(200):
+                    instance_id = f"churn{i}"
+                    register_instance(
+                        instance_id=instance_id,
+                        host="127.0.0.1",
+                        port=13360 + i % 50,
+                        binary_name="churn.exe",
+                    )
+                    if i % 2:
+                        unregister_instance(instance_id)
+            finally:
+                stop.set()
+                for t in threads:
+                    t.join(timeout=5)
+        self.assertEqual(errors, [])
+
+    def test_recovers_from_removed_registry_dir(self):
+        import shutil
+
+        register_instance(
+            instance_id="gone1",
+            host="127.0.0.1",
+            port=13355,
+            binary_name="gone.exe",
+        )
+        with patch.object(reg_module, "_get_watcher", return_value=None):
+            shutil.rmtree(self.temp_dir)
+            self.assertEqual(list_instances(), [])
+            self.assertEqual(cleanup_stale_instances(), 0)
+            self.assertIsNone(find_instance_by_binary("gone.exe"))
+
+            register_instance(
+                instance_id="back1",
+                host="127.0.0.1",
+                port=13356,
+                binary_name="back.exe",
+            )
+            self.assertEqual(find_instance_by_binary("back.exe").instance_id, "back1")
+            self.assertEqual([i.instance_id for i in list_instances()], ["back1"])
+            # The shared index was remapped in the recreated directory
+            self.assertTrue((Path(self.temp_dir) / "index.bin").exists())
+
+    def test_register_recreates_removed_registry_dir(self):
+        import shutil
+
+        list_instances()
+        shutil.rmtree(self.temp_dir)
+        register_instance(
+            instance_id="back2",
+            host="127.0.0.1",
+            port=13357,
+            binary_name="back.exe",
+        )
+        self.assertTrue((Path(self.temp_dir) / "back2.json").exists())
+
+    def test_find_by_id_reparses_modified_file(self):
+        register_instance(
+            instance_id="cached2",
+            host="127.0.0.1",
+            port=13347,
+            binary_name="before.exe",
+        )
+        self.assertEqual(find_instance_by_id("cached2").binary_name, "before.exe")
+
+        register_instance(
+            instance_id="cached2",
+            host="127.0.0.1",
+            port=13347,
+            binary_name="after_rename.exe",
+        )
+        self.assertEqual(find_instance_by_id("cached2").binary_name, "after_rename.exe")
+
+    def test_find_by_id_reparses_same_size_rewrite(self):
+        register_instance(
+            instance_id="cached5",
+            host="127.0.0.1",
+            port=13340,
+            binary_name="test.exe",
+        )
+        filepath = Path(self.temp_dir) / "cached5.json"
+        with patch.object(reg_module, "_get_watcher", return_value=None):
+            self.assertEqual(find_instance_by_id("cached5").port, 13340)
+
+            # Rewritten in place by another process: same inode and size
+            old_stat = filepath.stat()
+            filepath.write_bytes(filepath.read_bytes().replace(b"13340", b"13399"))
+            os.utime(filepath, ns=(old_stat.st_atime_ns, old_stat.st_mtime_ns + 1_000_000))
+            new_stat = filepath.stat()
+            self.assertEqual(new_stat.st_ino, old_stat.st_ino)
+            self.assertEqual(new_stat.st_size, old_stat.st_size)
+
+            self.assertEqual(find_instance_by_id("cached5").port, 13399)
+            self.assertEqual([i.port for i in list_instances()], [13399])
+
+    def test_refresh_updates_timestamp(self):
+        register_instance(
+            instance_id="cached4",
+            host="127.0.0.1",
+            port=13348,
+            binary_name="test.exe",
+        )
+        filepath = Path(self.temp_dir) / "cached4.json"
+        with patch.object(reg_module, "_get_watcher", return_value=None):
+            first = find_instance_by_id("cached4")
+            old_time = time.time() - STALE_TIMEOUT - 10
+            os.utime(filepath, (old_time, old_time))
+
+            self.assertTrue(find_instance_by_id("cached4").is_stale())
+            self.assertTrue(refresh_instance("cached4"))
+            refreshed = find_instance_by_id("cached4")
+            self.assertFalse(refreshed.is_stale())
+            # The object handed out before the refresh is left untouched
+            self.assertFalse(first.is_stale())
+            self.assertIsNot(first, refreshed)
+
+    def test_register_leaves_no_temp_files(self):
+        register_instance(
+            instance_id="atomic1",
+            host="127.0.0.1",
+            port=13349,
+            binary_name="test.exe",
+        )
+        self.assertIn("atomic1.json", os.listdir(self.temp_dir))
+        self.assertFalse([n for n in os.listdir(self.temp_dir) if ".tmp" in n])
+
+    def test_invalid_file_skipped_not_removed(self):
+        filepath = Path(self.temp_dir) / "broken.json"
+        filepath.write_text("{not json")
+
+        self.assertEqual(list_instances(), [])
+        self.assertTrue(filepath.exists())
+
+        # Fresh unreadable files may still be mid-write
+        self.assertEqual(cleanup_stale_instances(), 0)
+        self.assertTrue(filepath.exists())
+
+        old_time = time.time() - STALE_TIMEOUT - 10
+        os.utime(filepath, (old_time, old_time))
+        self.assertEqual(cleanup_stale_instances(), 1)
+        self.assertFalse(filepath.exists())
+
+    def test_list_instances_skips_stale_without_removing(self):
+        register_instance(
+            instance_id="quiet1",
+            host="127.0.0.1",
+            port=13351,
+            binary_name="quiet.exe",
+        )
+        # Our own PID is alive, but the heartbeat is overdue
+        filepath = Path(self.temp_dir) / "quiet1.json"
+        old_time = time.time() - STALE_TIMEOUT - 10
+        os.utime(filepath, (old_time, old_time))
+
+        self.assertEqual(list_instances(), [])
+        self.assertEqual(len(list_instances(include_stale=True)), 1)
+        self.assertTrue(filepath.exists())
+
+    def test_shared_index_tracks_registrations(self):
+        register_instance(
+            instance_id="idx1",
+            host="127.0.0.1",
+            port=13352,
+            binary_name="Indexed.exe",
+        )
+        index = reg_module._get_shared_index()
+        self.assertIsNotNone(index)
+        self.assertEqual(list(index.find_by_binary("indexed.exe")), ["idx1"])
+        self.assertEqual(find_instance_by_binary("indexed.exe").instance_id, "idx1")
+
+        unregister_instance("idx1")
+        self.assertEqual(list(index.find_by_binary("indexed.exe")), [])
+        self.assertIsNone(find_instance_by_binary("indexed.exe"))
+
+    def test_removed_index_slot_is_tombstoned_and_reused(self):
+        register_instance(
+            instance_id="idx2",
+            host="127.0.0.1",
+            port=13358,
+            binary_name="tomb.exe",
+        )
+        index = reg_module._get_shared_index()
+        instance_key = index._instance_key("idx2")
+        offset = index._find(instance_key)
+
+        unregister_instance("idx2")
+        pid = index.ENTRY.unpack_from(index._map, offset)[0]
+        self.assertEqual(pid, index.TOMBSTONE_PID)
+        self.assertEqual(list(index.find_by_binary("tomb.exe")), [])
+
+        register_instance(
+            instance_id="idx2",
+            host="127.0.0.1",
+            port=13359,
+            binary_name="tomb.exe",
+        )
+        self.assertEqual(index._find(instance_key), offset)
+        self.assertEqual(list(index.find_by_binary("tomb.exe")), ["idx2"])
+
+    def test_closed_index_is_ignored(self):
+        info = register_instance(
+            instance_id="idx9",
+            host="127.0.0.1",
+            port=13359,
+            binary_name="closed.exe",
+        )
+        index = reg_module._get_shared_index()
+        self.assertIsNotNone(index)
+        self.assertEqual(list(index.find_by_binary("closed.exe")), ["idx9"])
+
+        # A handle still held by another thread after the index was remapped
+        index.close()
+        index.add(info)
+        index.touch("idx9")
+        index.remove("idx9")
+        self.assertEqual(list(index.find_by_binary("closed.exe")), [])
+        reg_module._shared_index = None
+
+    def test_failed_index_is_not_retried(self):
+        with patch.object(reg_module, "_SharedIndex", side_effect=OSError("read-only")) as index_cls:
+            self.assertIsNone(reg_module._get_shared_index())
+            self.assertIsNone(reg_module._get_shared_index())
+        self.assertEqual(index_cls.call_count, 1)
+
+    def test_find_by_binary_falls_back_without_index_entry(self):
+        # Written directly, as by a plugin version without the shared index
+        info = InstanceInfo(
+            instance_id="noidx1",
+            host="127.0.0.1",
+            port=13353,
+            binary_name="unindexed.exe",
+            binary_path="",
+            pid=os.getpid(),
+            timestamp=time.time(),
+        )
+        with open(Path(self.temp_dir) / "noidx1.json", "w") as f:
+            json.dump(info.to_dict(), f)
+
+        found = find_instance_by_binary("unindexed.exe")
+        self.assertIsNotNone(found)
+        self.assertEqual(found.instance_id, "noidx1")
+
     def test_multiple_instances_different_ports(self):
         """Test that multiple instances can coexist with different ports."""
         for i in range(5):
@@ -305,12 +676,10 @@ class TestFindAvailablePort(unittest.TestCase):
 
     def setUp(self):
         self.temp_dir = tempfile.mkdtemp()
-        import ida_pro_mcp.instance_registry as reg_module
         self.original_registry_dir = REGISTRY_DIR
         reg_module.REGISTRY_DIR = Path(self.temp_dir)
 
     def tearDown(self):
-        import ida_pro_mcp.instance_registry as reg_module
         reg_module.REGISTRY_DIR = self.original_registry_dir
         import shutil
         shutil.rmtree(self.temp_dir, ignore_errors=True)
@@ -321,18 +690,210 @@ class TestFindAvailablePort(unittest.TestCase):
         self.assertGreaterEqual(port, 13337)
         self.assertLess(port, 13437)
 
-    def test_find_port_avoids_registered(self):
-        """Should not return a port that's already registered."""
-        # Register a fake instance on the first port
-        register_instance(
-            instance_id="blocker",
+    def test_find_port_prefers_range_start(self):
+        """A lone instance should get the default port when it is free."""
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+                probe.bind(("127.0.0.1", reg_module.PORT_RANGE_START))
+        except OSError:
+            self.skipTest("default port is in use")
+        for offset in (0, 50):
+            with patch("ida_pro_mcp.instance_registry.random.randrange", return_value=offset):
+                self.assertEqual(find_available_port("127.0.0.1"), reg_module.PORT_RANGE_START)
+
+    def test_find_port_skips_bound_port_in_range(self):
+        """Should skip in-use ports for a free one in the range, from any offset."""
+        for _ in range(10):
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as blocker, \
+                 socket.socket(socket.AF_INET, socket.SOCK_STREAM) as last_blocker:
+                blocker.bind(("127.0.0.1", 0))
+                blocker.listen(1)
+                blocked_port = blocker.getsockname()[1]
+                free_port = blocked_port + 1
+                try:
+                    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+                        probe.bind(("127.0.0.1", free_port))
+                    last_blocker.bind(("127.0.0.1", free_port + 1))
+                    last_blocker.listen(1)
+                except OSError:
+                    continue  # Neighbouring ports are busy, try another triple
+
+                # The range is [blocked_port, free_port, free_port + 1] with the
+                # first and last blocked; offset 1 starts the rest of the scan
+                # on the last port and has to wrap around
+                with patch("ida_pro_mcp.instance_registry.PORT_RANGE_START", blocked_port), \
+                     patch("ida_pro_mcp.instance_registry.PORT_RANGE_END", free_port + 2):
+                    for offset in (0, 1):
+                        with patch("ida_pro_mcp.instance_registry.random.randrange", return_value=offset):
+                            self.assertEqual(find_available_port("127.0.0.1"), free_port)
+                return
+        self.skipTest("could not find a free port between two bound ones")
+
+    def test_find_port_falls_back_when_range_taken(self):
+        """Should fall back to a kernel-assigned port when the range is taken."""
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as blocker:
+            blocker.bind(("127.0.0.1", 0))
+            blocker.listen(1)
+            blocked_port = blocker.getsockname()[1]
+            with patch("ida_pro_mcp.instance_registry.PORT_RANGE_START", blocked_port), \
+                 patch("ida_pro_mcp.instance_registry.PORT_RANGE_END", blocked_port + 1):
+                port = find_available_port("127.0.0.1")
+        self.assertNotEqual(port, blocked_port)
+        self.assertGreater(port, 0)
+
+
+class _FakeObserver:
+    """Stand-in for watchdog's Observer; events are delivered by the test."""
+
+    instances: list["_FakeObserver"] = []
+    fail_start = False
+
+    def __init__(self):
+        self.started = False
+        self.stopped = False
+        _FakeObserver.instances.append(self)
+
+    def schedule(self, handler, path, recursive=False):
+        self.handler = handler
+
+    def start(self):
+        if _FakeObserver.fail_start:
+            raise OSError("inotify watch limit reached")
+        self.started = True
+
+    def stop(self):
+        self.stopped = True
+
+    def join(self, timeout=None):
+        pass
+
+
+def _event(src_path, dest_path=""):
+    return SimpleNamespace(src_path=str(src_path), dest_path=str(dest_path), is_directory=False)
+
+
+class TestRegistryWatcher(unittest.TestCase):
+    """Tests for the event-driven registry snapshot."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.original_registry_dir = REGISTRY_DIR
+        reg_module.REGISTRY_DIR = Path(self.temp_dir)
+        self._stop_watcher()
+
+    def tearDown(self):
+        self._stop_watcher()
+        reg_module.REGISTRY_DIR = self.original_registry_dir
+        _close_shared_index()
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _stop_watcher(self):
+        if reg_module._watcher is not None:
+            reg_module._watcher.stop()
+            reg_module._watcher = None
+        reg_module._watcher_failed_dir = None
+
+    def _fake_watchdog(self):
+        _FakeObserver.instances = []
+        _FakeObserver.fail_start = False
+        return patch.multiple(reg_module, create=True, _HAVE_WATCHDOG=True, Observer=_FakeObserver)
+
+    def _write_external(self, instance_id: str, binary_name: str) -> Path:
+        """Write a registration file the way another process would."""
+        info = InstanceInfo(
+            instance_id=instance_id,
             host="127.0.0.1",
-            port=13337,
-            binary_name="blocker.exe",
+            port=13360,
+            binary_name=binary_name,
+            binary_path="",
+            pid=os.getpid(),
+            timestamp=time.time(),
         )
+        filepath = Path(self.temp_dir) / f"{instance_id}.json"
+        with open(filepath, "w") as f:
+            json.dump(info.to_dict(), f)
+        return filepath
 
-        port = find_available_port("127.0.0.1")
-        self.assertNotEqual(port, 13337)
+    def test_snapshot_follows_events(self):
+        with self._fake_watchdog():
+            existing = self._write_external("ext0", "existing.exe")
+            self.assertEqual([i.instance_id for i in list_instances()], ["ext0"])
+            watcher = reg_module._watcher
+            self.assertIsNotNone(watcher)
+            self.assertTrue(_FakeObserver.instances[0].started)
+
+            # Not visible until the watcher is told about it
+            created = self._write_external("ext1", "external.exe")
+            self.assertIsNone(find_instance_by_binary("external.exe"))
+            watcher.on_created(_event(created))
+            self.assertEqual(find_instance_by_binary("external.exe").instance_id, "ext1")
+
+            moved = Path(self.temp_dir) / "ext2.json"
+            os.replace(created, moved)
+            watcher.on_moved(_event(created, moved))
+            self.assertIsNone(watcher.get("ext1.json"))
+            self.assertIsNotNone(watcher.get("ext2.json"))
+
+            existing.unlink()
+            watcher.on_deleted(_event(existing))
+            self.assertIsNone(watcher.get("ext0.json"))
+            self.assertNotIn(str(existing), reg_module._parse_cache)
+            self.assertEqual([i.binary_name for i in list_instances()], ["external.exe"])
+
+    def test_failed_start_is_not_retried(self):
+        with self._fake_watchdog():
+            _FakeObserver.fail_start = True
+            self._write_external("ext3", "fallback.exe")
+
+            self.assertEqual(len(list_instances()), 1)
+            self.assertEqual(find_instance_by_binary("fallback.exe").instance_id, "ext3")
+            self.assertIsNone(reg_module._watcher)
+            self.assertEqual(len(_FakeObserver.instances), 1)
+
+    def test_failed_scan_stops_observer(self):
+        with self._fake_watchdog():
+            with patch.object(reg_module, "_registry_entries", side_effect=OSError("gone")):
+                self.assertIsNone(reg_module._get_watcher())
+            self.assertTrue(_FakeObserver.instances[0].stopped)
+
+    def test_restarts_after_directory_removed(self):
+        import shutil
+
+        with self._fake_watchdog():
+            self._write_external("ext4", "old.exe")
+            self.assertEqual(len(list_instances()), 1)
+            watcher = reg_module._watcher
+
+            shutil.rmtree(self.temp_dir)
+            self.assertEqual(list_instances(), [])
+            self.assertTrue(_FakeObserver.instances[0].stopped)
+            self.assertIsNot(reg_module._watcher, watcher)
+
+            # The recreated directory is watched again
+            created = self._write_external("ext5", "new.exe")
+            reg_module._watcher.on_created(_event(created))
+            self.assertEqual(find_instance_by_binary("new.exe").instance_id, "ext5")
+
+    @unittest.skipUnless(reg_module._HAVE_WATCHDOG, "watchdog not installed")
+    def test_picks_up_external_changes(self):
+        self.assertEqual(list_instances(), [])
+        self.assertIsNotNone(reg_module._watcher)
+
+        # Simulate another process writing and removing a registration
+        filepath = self._write_external("ext1", "external.exe")
+        self.assertTrue(self._wait_for(lambda: find_instance_by_binary("external.exe") is not None))
+
+        filepath.unlink()
+        self.assertTrue(self._wait_for(lambda: list_instances() == []))
+
+    def _wait_for(self, predicate, timeout=5.0):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if predicate():
+                return True
+            time.sleep(0.05)
+        return False
 
 
 class TestHeartbeatThread(unittest.TestCase):
@@ -340,13 +901,12 @@ class TestHeartbeatThread(unittest.TestCase):
 
     def setUp(self):
         self.temp_dir = tempfile.mkdtemp()
-        import ida_pro_mcp.instance_registry as reg_module
         self.original_registry_dir = REGISTRY_DIR
         reg_module.REGISTRY_DIR = Path(self.temp_dir)
 
     def tearDown(self):
-        import ida_pro_mcp.instance_registry as reg_module
         reg_module.REGISTRY_DIR = self.original_registry_dir
+        _close_shared_index()
         import shutil
         shutil.rmtree(self.temp_dir, ignore_errors=True)
 
@@ -364,6 +924,123 @@ class TestHeartbeatThread(unittest.TestCase):
         hb.stop()
         self.assertIsNone(hb._thread)
 
+    def test_worker_survives_refresh_error(self):
+        import threading
+
+        calls = []
+        refreshed = threading.Event()
+
+        def failing_refresh(instance_id):
+            if threading.current_thread() is threading.main_thread():
+                return True  # Initial refresh from start()
+            calls.append(instance_id)
+            if len(calls) == 1:
+                raise RuntimeError("unexpected refresh failure")
+            refreshed.set()
+            return True
+
+        hb = HeartbeatThread("hb7")
+        with (
+            patch.object(reg_module, "refresh_instance", failing_refresh),
+            patch("builtins.print") as mock_print,
+        ):
+            hb.start()
+            shared = hb._thread
+            try:
+                reg_module._heartbeat._wakeup.set()
+                deadline = time.monotonic() + 5
+                while not calls and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                reg_module._heartbeat._wakeup.set()
+                self.assertTrue(refreshed.wait(timeout=5))
+                self.assertTrue(shared.is_alive())
+                mock_print.assert_called_once()
+                self.assertIn("hb7", mock_print.call_args.args[0])
+            finally:
+                hb.stop()
+        shared.join(timeout=5)
+        self.assertFalse(shared.is_alive())
+
+    def test_dead_worker_is_replaced(self):
+        import threading
+
+        dead = threading.Thread(target=lambda: None)
+        dead.start()
+        dead.join()
+        reg_module._heartbeat._thread = dead
+
+        hb = HeartbeatThread("hb8")
+        with patch.object(reg_module, "refresh_instance", return_value=True):
+            hb.start()
+            try:
+                self.assertIsNot(hb._thread, dead)
+                self.assertTrue(hb._thread.is_alive())
+            finally:
+                shared = hb._thread
+                hb.stop()
+        shared.join(timeout=5)
+        self.assertFalse(shared.is_alive())
+
+    def test_heartbeats_share_one_thread(self):
+        for instance_id in ("hb2", "hb3"):
+            register_instance(
+                instance_id=instance_id,
+                host="127.0.0.1",
+                port=13337,
+                binary_name="test.exe",
+            )
+
+        hb2 = HeartbeatThread("hb2")
+        hb3 = HeartbeatThread("hb3")
+        hb2.start()
+        hb3.start()
+        try:
+            self.assertIs(hb2._thread, hb3._thread)
+        finally:
+            shared = hb2._thread
+            hb2.stop()
+            self.assertTrue(shared.is_alive())
+            hb3.stop()
+        shared.join(timeout=5)
+        self.assertFalse(shared.is_alive())
+
+    def test_stop_interrupts_heartbeat_batch(self):
+        import threading
+
+        entered = threading.Event()
+        release = threading.Event()
+        worker_refreshes = []
+
+        def blocking_refresh(instance_id):
+            if threading.current_thread() is threading.main_thread():
+                return True  # Initial refresh from start()
+            worker_refreshes.append(instance_id)
+            entered.set()
+            release.wait(timeout=5)
+            return True
+
+        heartbeats = [HeartbeatThread(f"hb{i}") for i in range(4, 7)]
+        with patch.object(reg_module, "refresh_instance", blocking_refresh):
+            for hb in heartbeats:
+                hb.start()
+            shared = heartbeats[0]._thread
+            # Run a batch now instead of waiting for HEARTBEAT_INTERVAL
+            reg_module._heartbeat._wakeup.set()
+            self.assertTrue(entered.wait(timeout=5))
+
+            for hb in heartbeats[:-1]:
+                hb.stop()
+            timer = threading.Timer(0.1, release.set)
+            timer.start()
+            started = time.monotonic()
+            heartbeats[-1].stop()
+            elapsed = time.monotonic() - started
+            timer.join()
+
+        self.assertLess(elapsed, 1)
+        self.assertFalse(shared.is_alive())
+        self.assertEqual(len(worker_refreshes), 1)
+
 
 if __name__ == "__main__":
     unittest.main()